@@ -11,13 +11,17 @@ This example shows:
 """
 
 import asyncio
-import json
 import os
 from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
 from claude_code_sdk import query, ClaudeCodeOptions, AssistantMessage, ToolUseBlock, TextBlock
 
+from src.bootstrap import run
+from src.config import load_mcp_config
+from src.persistence import serialization
+from src.persistence.files import newest_files
+
 # Load environment variables
 load_dotenv()
 
@@ -25,14 +29,21 @@ load_dotenv()
 class AdvancedMCPClient:
     """Advanced client for interacting with monetized MCP services"""
     
-    def __init__(self):
+    def __init__(self, max_concurrent_purchases: int = 1):
         # Load MCP configuration
-        with open('config/mcp_config.json') as f:
-            self.mcp_config = json.load(f)
+        self.mcp_config = load_mcp_config()
         
         # Create results directory
         self.results_dir = Path("results")
         self.results_dir.mkdir(exist_ok=True)
+        
+        # Analyses that make purchases share one wallet, so bound them
+        self._purchase_sem = asyncio.Semaphore(max_concurrent_purchases)
+    
+    async def _limit_purchases(self, analysis):
+        """Run a purchasing analysis under the purchase concurrency limit"""
+        async with self._purchase_sem:
+            return await analysis()
     
     async def discover_services(self):
         """Discover all available MCP services"""
@@ -94,7 +105,7 @@ class AdvancedMCPClient:
             if isinstance(message, AssistantMessage):
                 for block in message.content:
                     if isinstance(block, ToolUseBlock):
-                        if "make-purchase" in str(block.input):
+                        if block.input.get('toolName') == 'make-purchase':
                             print(f"  💳 Making purchase: {block.input.get('itemId', 'unknown')}")
                             metrics['purchase_made'] = True
                     elif isinstance(block, TextBlock):
@@ -170,15 +181,12 @@ class AdvancedMCPClient:
         print("\n📈 Generating trading signals...")
         
         # Load recent market data if available
-        recent_data = []
-        findings_dir = Path("knowledge/research/findings")
-        if findings_dir.exists():
-            for f in sorted(findings_dir.glob("*.json"))[-5:]:
-                try:
-                    with open(f) as file:
-                        recent_data.append(json.load(file))
-                except:
-                    pass
+        recent_files = newest_files(Path("knowledge/research/findings"), "*.json", 5)
+        findings = await asyncio.gather(
+            *(asyncio.to_thread(serialization.read_json, f) for f in recent_files),
+            return_exceptions=True
+        )
+        recent_data = [data for data in findings if not isinstance(data, Exception)]
         
         options = ClaudeCodeOptions(
             system_prompt="You are a trading signal generator analyzing Solana markets.",
@@ -218,8 +226,7 @@ class AdvancedMCPClient:
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         filename = self.results_dir / f"advanced_analysis_{timestamp}.json"
         
-        with open(filename, 'w') as f:
-            json.dump(results, f, indent=2, default=str)
+        await asyncio.to_thread(serialization.write_json, filename, results, default=str)
         
         print(f"\n💾 Results saved to: {filename}")
         return filename
@@ -235,31 +242,26 @@ class AdvancedMCPClient:
             'analyses': {}
         }
         
-        # Run each analysis
-        try:
-            # 1. Service Discovery
-            services = await self.discover_services()
-            results['analyses']['services'] = services
-            
-            # 2. Solana Metrics
-            metrics = await self.get_solana_metrics()
-            results['analyses']['metrics'] = metrics
-            
-            # 3. Arbitrage Analysis
-            arbitrage = await self.analyze_arbitrage_opportunities()
-            results['analyses']['arbitrage'] = arbitrage
-            
-            # 4. Whale Monitoring
-            whales = await self.monitor_whale_activity()
-            results['analyses']['whales'] = whales
-            
-            # 5. Trading Signals
-            signals = await self.generate_trading_signals()
-            results['analyses']['signals'] = signals
-            
-        except Exception as e:
-            print(f"\n❌ Error during analysis: {e}")
-            results['error'] = str(e)
+        # Service discovery is free, so it overlaps with the paid analyses,
+        # which run under the purchase limit
+        paid_analyses = {
+            'metrics': self.get_solana_metrics,
+            'arbitrage': self.analyze_arbitrage_opportunities,
+            'whales': self.monitor_whale_activity,
+            'signals': self.generate_trading_signals,
+        }
+        outcomes = await asyncio.gather(
+            self.discover_services(),
+            *(self._limit_purchases(analysis) for analysis in paid_analyses.values()),
+            return_exceptions=True
+        )
+        
+        for name, outcome in zip(['services', *paid_analyses], outcomes):
+            if isinstance(outcome, BaseException):
+                print(f"\n❌ Error during {name} analysis: {outcome!r}")
+                results.setdefault('errors', {})[name] = repr(outcome)
+            else:
+                results['analyses'][name] = outcome
         
         # Save results
         filename = await self.save_results(results)
@@ -301,7 +303,9 @@ async def main():
     print("5. Monitor whale activity")
     print("6. Generate trading signals")
     
-    choice = input("\nEnter your choice (1-6): ").strip()
+    # Read the choice off the event loop thread so input() doesn't block it
+    loop = asyncio.get_running_loop()
+    choice = (await loop.run_in_executor(None, input, "\nEnter your choice (1-6): ")).strip()
     
     if choice == "1":
         await client.run_comprehensive_analysis()
@@ -325,4 +329,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run(main)
\ No newline at end of file
@@ -4,9 +4,10 @@ WORKING Cambrian Trading Agent using MCP
 This correctly configures the MCP server using the dictionary format
 """
 
-import anyio
 import asyncio
 import os
+import re
+from signal import SIGTERM
 import sys
 import argparse
 import json
@@ -16,23 +17,159 @@ from pathlib import Path
 from dotenv import load_dotenv
 from contextlib import redirect_stderr
 import io
+from collections import deque
+from functools import lru_cache
 
 from claude_code_sdk import (
     query as claude_query,
     ClaudeCodeOptions,
     AssistantMessage,
+    UserMessage,
     ResultMessage,
     TextBlock,
     ToolUseBlock,
     ToolResultBlock
 )
 
+from src.bootstrap import run
+from src.config import load_mcp_config
+from src.persistence import serialization
+from src.persistence.files import newest_files
 from src.persistence.state_manager import StateManager
 from src.agent.goals import GoalManager
 
 # Load environment variables
 load_dotenv()
 
+MCP_TOOLS = [
+    "mcp__fluora__exploreServices",
+    "mcp__fluora__getServiceDetails",
+    "mcp__fluora__callServiceTool",
+]
+
+# Goal title keywords -> research method, checked in order (first match wins)
+GOAL_ROUTES = (
+    (re.compile(r"strategy|profit|backtest|trading"), "research_strategies"),
+    (re.compile(r"market|price|trend|analysis"), "research_market_analysis"),
+    (re.compile(r"arbitrage"), "research_arbitrage_opportunities"),
+    # Trading signals and volatility research reuse market analysis
+    (re.compile(r"entry|exit|volatility"), "research_market_analysis"),
+)
+
+# Patterns for pulling prices and trading signals out of Claude's replies
+PRICE_PATTERN = re.compile(r'\$(\d+\.?\d*)')
+SIGNAL_PATTERN = re.compile(r'signal|setup|entry|target')
+SIGNAL_LINE_PATTERN = re.compile(r'signal|setup|entry|target|stop|profit')
+MARKET_FINDING_PATTERN = re.compile(r'cycle_\d+_market_analysis\.json$')
+
+MARKET_ANALYSIS_SYSTEM_PROMPT = """You are an advanced AI trading analyst for the Cambrian Trading Agent.
+You make REAL purchases from the Cambrian API (0.001 USDC per call on Base Sepolia).
+Your analysis should be progressively more sophisticated with each cycle.
+Focus on actionable insights and specific trading setups.
+
+IMPORTANT: You have access to MCP tools. Use them DIRECTLY - do NOT use Task, WebSearch, or other tools to look for them.
+
+To make a REAL purchase of the current SOL price, follow these exact steps:
+
+1. First, use the tool mcp__fluora__exploreServices with {'category': ''} to find servers
+
+2. Find the Cambrian API server from the results (it will have server ID starting with 9f2e4fe1)
+
+3. Use mcp__fluora__getServiceDetails with:
+   - serverId: "9f2e4fe1-dc04-4ed1-bab4-0f374cb9f8a7"
+
+4. Use mcp__fluora__callServiceTool to call 'pricing-listing' first to see available items
+
+5. Use mcp__fluora__callServiceTool to call 'payment-method' to get the wallet address
+
+6. Finally, use mcp__fluora__callServiceTool to call 'make-purchase' with:
+   - serverId: "9f2e4fe1-dc04-4ed1-bab4-0f374cb9f8a7"
+   - mcpServerUrl: "http://localhost:80"
+   - toolName: "make-purchase"
+   - args: {
+       "itemId": "solanapricecurrent",
+       "params": {"token_address": "So11111111111111111111111111111111111111112"},
+       "paymentMethod": "USDC_BASE_SEPOLIA",
+       "itemPrice": 0.001,
+       "serverWalletAddress": (get this from payment-method response)
+     }
+
+After getting the price, save your analysis to the findings file given in the request.
+Include: cycle number, timestamp, price, trend analysis, and trading insights."""
+
+ARBITRAGE_SYSTEM_PROMPT = """You are researching arbitrage opportunities across Solana DEXs.
+Use the fluora MCP server to purchase pool and price data from different DEXs."""
+
+GOAL_PLANNER_SYSTEM_PROMPT = """You are a strategic research planner for a Solana trading agent.
+Your task is to generate intelligent, actionable research goals based on current market conditions.
+The agent has access to the Cambrian API for real-time Solana data."""
+
+BANNER = """
+    ╔═══════════════════════════════════════════╗
+    ║     Cambrian Trading Agent v2.0          ║
+    ║        REAL MCP Implementation            ║
+    ║                                           ║
+    ║   💰 Makes REAL monetized purchases! 💰   ║
+    ║                                           ║
+    ║   Using fluora MCP server configured in:  ║
+    ║   config/mcp_config.json                  ║
+    ╚═══════════════════════════════════════════╝
+    
+"""
+
+GOAL_GENERATION_PROMPT = """Generate 3-5 strategic research goals for a Solana trading agent.
+{context}
+Consider:
+1. Current market conditions and trends
+2. Different types of trading strategies (momentum, arbitrage, liquidity provision)
+3. Risk management and portfolio optimization
+4. Specific Solana ecosystem opportunities
+
+Create goals that are:
+- Specific and measurable
+- Achievable through data analysis
+- Relevant to profitable trading
+- Time-bound (can make progress each cycle)
+
+Save the goals to: {goals_file}
+
+Format exactly as shown (include ALL fields):
+{{
+  "goals": [
+    {{
+      "id": "goal_001",
+      "title": "Clear, specific goal title",
+      "description": "Detailed description of what to research and why",
+      "status": "active",
+      "priority": "high",
+      "created_at": "{created_at}",
+      "progress": 0,
+      "metrics": ["metric1", "metric2"]
+    }}
+  ]
+}}
+
+Make the goals diverse and complementary, covering different aspects of Solana trading."""
+
+_BAR = "=" * 60
+CYCLE_HEADER = f"\n{_BAR}\n[{{time}}] Starting Cycle #{{cycle}}\n{_BAR}\n"
+
+MARKET_ANALYSIS_PROMPT = """Cycle #{cycle}: Advanced Solana Market Analysis
+{context}
+Make a REAL purchase to get the current SOL price using the steps in your instructions,
+then save your analysis to:
+   {findings_file}"""
+
+
+@lru_cache(maxsize=128)
+def route_goal(title: str) -> str:
+    """Return the name of the research method for a goal title"""
+    title = title.lower()
+    for pattern, handler in GOAL_ROUTES:
+        if pattern.search(title):
+            return handler
+    return "research_general"
+
 
 class CambrianMCPAgent:
     """Agent that makes REAL MCP purchases through fluora server"""
@@ -47,42 +184,138 @@ class CambrianMCPAgent:
         # self.strategy_engine = StrategyResearchEngine()
         self.cycle_count = 0
         self.running = False
+        self._stop = asyncio.Event()
         self.user_config = None
         self.current_analysis = {}
         self.current_signals = []
+        self._findings_dir = Path("knowledge/research/findings")
+        self._findings_dir_abs = os.path.abspath(self._findings_dir)
+        self._goals_file_abs = os.path.abspath("knowledge/goals/goals.json")
+        # Rolling cache of the newest (file name, finding) pairs, oldest first
+        self._recent_findings = deque(maxlen=10)
+        # Newest market-analysis finding, kept apart so other findings can't evict it
+        self._latest_market_finding = None
+        # Goal-manager version whose goals were last put into the saved state
+        self._saved_goals_version = None
         
         # Load the MCP config
-        with open('config/mcp_config.json') as f:
-            self.mcp_config = json.load(f)
+        self.mcp_config = load_mcp_config()
         
         # Load user config if exists
         self._load_user_config()
         
+        # Bound how many purchasing conversations (market analysis, arbitrage)
+        # run at once; serial by default, tunable via agent.mcp_max_concurrency
+        max_concurrency = 1
+        # How many of the top goals to research each cycle (agent.max_concurrent_research)
+        max_research = 1
+        if self.user_config and 'agent' in self.user_config:
+            max_concurrency = self.user_config['agent'].get('mcp_max_concurrency', 1)
+            max_research = self.user_config['agent'].get('max_concurrent_research', 1)
+        self._purchase_sem = asyncio.Semaphore(max(1, int(max_concurrency)))
+        self._max_concurrent_research = max(1, int(max_research))
+        
+        # Build the Claude options once; they are identical every cycle
+        self._market_options = ClaudeCodeOptions(
+            system_prompt=MARKET_ANALYSIS_SYSTEM_PROMPT,
+            mcp_servers=self.mcp_config['mcpServers'],
+            allowed_tools=MCP_TOOLS + ["Write"],  # Write to save findings
+            max_turns=12,  # Six purchase steps plus the save, with some slack
+            model="claude-sonnet-4-20250514"
+        )
+        self._arbitrage_options = ClaudeCodeOptions(
+            system_prompt=ARBITRAGE_SYSTEM_PROMPT,
+            mcp_servers=self.mcp_config['mcpServers'],
+            allowed_tools=MCP_TOOLS + ["Write"],
+            max_turns=150  # Allow plenty of turns
+        )
+        self._goal_options = ClaudeCodeOptions(
+            system_prompt=GOAL_PLANNER_SYSTEM_PROMPT,
+            allowed_tools=["Write"],
+            max_turns=100  # Allow plenty of turns for goal generation
+        )
+        
     async def initialize(self):
         """Initialize agent and restore state"""
         print("🚀 Initializing Cambrian MCP Agent...")
         print("💰 This will make REAL purchases through the monetized MCP!")
         
-        # Load previous state
-        state = await self.state_manager.load_state()
+        # Create the findings directory once instead of on every save
+        self._findings_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Load previous state, goals and recent findings concurrently
+        state, _, _ = await asyncio.gather(
+            self.state_manager.load_state(),
+            self.goal_manager.load_goals(),
+            self._load_recent_findings()
+        )
         if state:
             self.cycle_count = state.get('cycle_count', 0)
             print(f"✓ Restored state (cycles completed: {self.cycle_count})")
         else:
             print("✓ Starting fresh")
             
-        # Load goals
-        await self.goal_manager.load_goals()
         print(f"✓ Loaded {len(self.goal_manager.goals)} research goals")
         print("✓ Agent initialized\n")
     
+    async def _load_recent_findings(self):
+        """Seed the rolling findings cache from disk"""
+        recent_files = newest_files(self._findings_dir, "*.json", self._recent_findings.maxlen)
+        # Read the files in parallel worker threads; unreadable ones come back as exceptions
+        findings = await asyncio.gather(
+            *(asyncio.to_thread(serialization.read_json, f) for f in recent_files),
+            return_exceptions=True
+        )
+        for path, data in zip(recent_files, findings):
+            if not isinstance(data, Exception):
+                self._remember_finding(path.name, data)
+        
+        # The newest market analysis may be older than the cached findings
+        if self._latest_market_finding is None:
+            for path in newest_files(self._findings_dir, "cycle_*_market_analysis.json", 1):
+                try:
+                    data = await asyncio.to_thread(serialization.read_json, path)
+                except (OSError, ValueError):
+                    data = None
+                if isinstance(data, dict):
+                    self._latest_market_finding = data
+    
+    def _remember_finding(self, name: str, finding):
+        """Add a finding to the rolling cache, tracking the newest market analysis"""
+        self._recent_findings.append((name, finding))
+        if MARKET_FINDING_PATTERN.match(name) and isinstance(finding, dict):
+            self._latest_market_finding = finding
+    
+    def _parse_written_finding(self, tool_input: dict):
+        """Return (file name, finding) if a Write tool input saves a finding, else None"""
+        file_path = tool_input.get('file_path', '')
+        if not file_path.endswith('.json') or os.path.dirname(file_path) != self._findings_dir_abs:
+            return None
+        try:
+            finding = serialization.loads(tool_input.get('content', ''))
+        except ValueError:
+            return None
+        return os.path.basename(file_path), finding
+    
+    def _remember_confirmed_writes(self, message, pending_writes: dict) -> bool:
+        """Cache pending findings whose Write succeeded; returns True if any did"""
+        if isinstance(message.content, str):
+            return False
+        confirmed = False
+        for block in message.content:
+            if isinstance(block, ToolResultBlock) and not block.is_error:
+                written = pending_writes.pop(block.tool_use_id, None)
+                if written:
+                    self._remember_finding(*written)
+                    confirmed = True
+        return confirmed
+    
     async def execute_cycle(self):
         """Execute one research cycle with REAL MCP purchases"""
         self.cycle_count += 1
+        now = datetime.now()
         
-        print(f"\n{'='*60}")
-        print(f"[{datetime.now().strftime('%H:%M:%S')}] Starting Cycle #{self.cycle_count}")
-        print(f"{'='*60}")
+        sys.stdout.write(CYCLE_HEADER.format(time=now.strftime('%H:%M:%S'), cycle=self.cycle_count))
         
         # Get active goals
         active_goals = await self.goal_manager.get_active_goals()
@@ -96,33 +329,41 @@ class CambrianMCPAgent:
             await self.goal_manager.load_goals()
             active_goals = await self.goal_manager.get_active_goals()
             print(f"✨ Generated {len(active_goals)} new research goals!")
+        goals_version = self.goal_manager.version
         
         if active_goals:
-            goal = active_goals[0]
-            print(f"🔬 Working on: {goal.title}")
+            goals = active_goals[:self._max_concurrent_research]
+            for goal in goals:
+                print(f"🔬 Working on: {goal.title}")
             
-            # Strategy research every 5 cycles or on strategy-related goals
-            if (self.cycle_count % 5 == 0 or 
-                any(keyword in goal.title.lower() for keyword in ["strategy", "profit", "backtest", "trading"])):
-                await self.research_strategies()
-            # Execute research based on goal type
-            elif any(keyword in goal.title.lower() for keyword in ["market", "price", "trend", "analysis"]):
-                await self.research_market_analysis()
-            elif "arbitrage" in goal.title.lower():
-                await self.research_arbitrage_opportunities()
-            elif any(keyword in goal.title.lower() for keyword in ["entry", "exit", "trading"]):
-                await self.research_market_analysis()  # Use market analysis for trading signals too
-            elif "volatility" in goal.title.lower():
-                await self.research_market_analysis()  # Use market analysis for volatility research
+            # Strategy research every 5 cycles, otherwise route on the goal
+            # types; each distinct research type runs once, concurrently
+            if self.cycle_count % 5 == 0:
+                handlers = ["research_strategies"]
             else:
-                await self.research_general()
-        
-        # Save state
-        await self.state_manager.save_state({
-            'last_run': datetime.now().isoformat(),
-            'cycle_count': self.cycle_count,
-            'active_goals': [g.to_dict() for g in active_goals]
-        })
+                handlers = list(dict.fromkeys(route_goal(goal.title) for goal in goals))
+            results = await asyncio.gather(
+                *(getattr(self, handler)() for handler in handlers),
+                return_exceptions=True
+            )
+            failures = [
+                (handler, result) for handler, result in zip(handlers, results)
+                if isinstance(result, BaseException)
+            ]
+            for handler, error in failures:
+                print(f"\n❌ Error during {handler}: {error}")
+            if failures:
+                raise failures[0][1]
+        
+        # Save state; the goals are only re-serialized when they changed
+        updates = {
+            'last_run': now.isoformat(),
+            'cycle_count': self.cycle_count
+        }
+        if goals_version != self._saved_goals_version:
+            updates['active_goals'] = [g.to_dict() for g in active_goals]
+            self._saved_goals_version = goals_version
+        await self.state_manager.save_state(updates)
         
         print(f"\n✅ Cycle #{self.cycle_count} completed")
     
@@ -136,16 +377,9 @@ class CambrianMCPAgent:
         latest_finding = None
         
         # Try to get latest price from recent findings
-        findings_dir = Path("knowledge/research/findings")
-        if findings_dir.exists():
-            recent_files = sorted(findings_dir.glob("cycle_*_market_analysis.json"))
-            if recent_files:
-                try:
-                    with open(recent_files[-1]) as f:
-                        latest_finding = json.load(f)
-                        current_price = latest_finding.get('price')
-                except:
-                    pass
+        latest_finding = self._latest_market_finding
+        if latest_finding:
+            current_price = latest_finding.get('price')
         
         # Perform basic analysis if we have data
         if current_price:
@@ -175,60 +409,12 @@ class CambrianMCPAgent:
         if latest_finding:
             context = f"\nPrevious price: ${current_price:.2f} from cycle {latest_finding.get('cycle', '?')}\n"
         
-        # Advanced system prompt
-        system_prompt = """You are an advanced AI trading analyst for the Cambrian Trading Agent.
-You make REAL purchases from the Cambrian API (0.001 USDC per call on Base Sepolia).
-Your analysis should be progressively more sophisticated with each cycle.
-Focus on actionable insights and specific trading setups."""
-        
-        # Configure options
-        options = ClaudeCodeOptions(
-            system_prompt=system_prompt,
-            mcp_servers=self.mcp_config['mcpServers'],
-            allowed_tools=[
-                "mcp__fluora__exploreServices",
-                "mcp__fluora__getServiceDetails",
-                "mcp__fluora__callServiceTool",
-                "Write"  # To save findings
-            ],
-            max_turns=150,
-            model="claude-sonnet-4-20250514"
-        )
-        
         # Research prompt
-        prompt = f"""Cycle #{self.cycle_count}: Advanced Solana Market Analysis
-{context}
-IMPORTANT: You have access to MCP tools. Use them DIRECTLY - do NOT use Task, WebSearch, or other tools to look for them.
-
-Make a REAL purchase to get the current SOL price by following these exact steps:
-
-1. First, use the tool mcp__fluora__exploreServices with {{'category': ''}} to find servers
-
-2. Find the Cambrian API server from the results (it will have server ID starting with 9f2e4fe1)
-
-3. Use mcp__fluora__getServiceDetails with:
-   - serverId: "9f2e4fe1-dc04-4ed1-bab4-0f374cb9f8a7"
-
-4. Use mcp__fluora__callServiceTool to call 'pricing-listing' first to see available items
-
-5. Use mcp__fluora__callServiceTool to call 'payment-method' to get the wallet address
-
-6. Finally, use mcp__fluora__callServiceTool to call 'make-purchase' with:
-   - serverId: "9f2e4fe1-dc04-4ed1-bab4-0f374cb9f8a7"
-   - mcpServerUrl: "http://localhost:80"
-   - toolName: "make-purchase"
-   - args: {{
-       "itemId": "solanapricecurrent",
-       "params": {{"token_address": "So11111111111111111111111111111111111111112"}},
-       "paymentMethod": "USDC_BASE_SEPOLIA",
-       "itemPrice": 0.001,
-       "serverWalletAddress": (get this from payment-method response)
-     }}
-
-7. After getting the price, save your analysis to:
-   {os.path.abspath(f'knowledge/research/findings/cycle_{self.cycle_count}_market_analysis.json')}
-
-Include: cycle number, timestamp, price, trend analysis, and trading insights."""
+        prompt = MARKET_ANALYSIS_PROMPT.format(
+            cycle=self.cycle_count,
+            context=context,
+            findings_file=os.path.join(self._findings_dir_abs, f'cycle_{self.cycle_count}_market_analysis.json')
+        )
         
         print("\n📈 Researching market conditions...")
         print("💳 Making REAL MCP purchases...")
@@ -237,55 +423,77 @@ Include: cycle number, timestamp, price, trend analysis, and trading insights.""
         purchase_made = False
         mcp_details_found = False
         messages_count = 0
-        tools_used = []
+        tools_used = set()
         current_price_found = None
         analysis_saved = False
+        # Findings Claude is writing, by tool-use id, until the write succeeds
+        pending_writes = {}
         
         try:
-            # Suppress RuntimeError about cancel scope
-            with warnings.catch_warnings():
-                warnings.filterwarnings("ignore")
-                async for message in claude_query(prompt=prompt, options=options):
-                    messages_count += 1
-                    
-                    if isinstance(message, AssistantMessage):
-                        for block in message.content:
-                            if isinstance(block, TextBlock):
-                                # Extract and show key information
-                                text = str(block.text)
-                                
-                                # Look for price in the text
-                                if "price" in text.lower() and "$" in text:
-                                    import re
-                                    price_match = re.search(r'\$(\d+\.?\d*)', text)
-                                    if price_match:
-                                        current_price_found = float(price_match.group(1))
-                                        self._last_price_found = current_price_found  # Track for strategy research
-                                        print(f"\n💰 Price found: ${current_price_found:.2f}")
-                                        
-                                        # Price found from MCP purchase
-                                        pass
+            # Purchasing conversations run one at a time
+            async with self._purchase_sem:
+                # Suppress RuntimeError about cancel scope
+                with warnings.catch_warnings():
+                    warnings.filterwarnings("ignore")
+                    stream = claude_query(prompt=prompt, options=self._market_options)
+                    try:
+                        async for message in stream:
+                            messages_count += 1
+                        
+                            if isinstance(message, AssistantMessage):
+                                for block in message.content:
+                                    if isinstance(block, TextBlock):
+                                        # Extract and show key information
+                                        text = block.text
+                                        lowered = text.lower()
+                                    
+                                        # Look for price in the text
+                                        if "price" in lowered and "$" in text:
+                                            price_match = PRICE_PATTERN.search(text)
+                                            if price_match:
+                                                current_price_found = float(price_match.group(1))
+                                                self._last_price_found = current_price_found  # Track for strategy research
+                                                print(f"\n💰 Price found: ${current_price_found:.2f}")
+                                            
+                                                # Price found from MCP purchase
+                                                pass
+                                    
+                                        # Show trading signals
+                                        if SIGNAL_PATTERN.search(lowered):
+                                            # Extract just the relevant part
+                                            for line, lowered_line in zip(text.split('\n'), lowered.split('\n')):
+                                                if SIGNAL_LINE_PATTERN.search(lowered_line):
+                                                    print(f"   📍 {line.strip()}")
                                 
-                                # Show trading signals
-                                if any(keyword in text.lower() for keyword in ['signal', 'setup', 'entry', 'target']):
-                                    # Extract just the relevant part
-                                    lines = text.split('\n')
-                                    for line in lines:
-                                        if any(keyword in line.lower() for keyword in ['signal', 'setup', 'entry', 'target', 'stop', 'profit']):
-                                            print(f"   📍 {line.strip()}")
+                                    elif isinstance(block, ToolUseBlock):
+                                        tools_used.add(block.name)
+                                    
+                                        if (block.name == 'mcp__fluora__callServiceTool' and 
+                                            isinstance(block.input, dict) and 
+                                            block.input.get('toolName') == 'make-purchase'):
+                                            purchase_made = True
+                                        elif block.name == 'Write':
+                                            written = self._parse_written_finding(block.input)
+                                            if written:
+                                                pending_writes[block.id] = written
                             
-                            elif isinstance(block, ToolUseBlock):
-                                tools_used.append(block.name)
-                                
-                                if (block.name == 'mcp__fluora__callServiceTool' and 
-                                    isinstance(block.input, dict) and 
-                                    block.input.get('toolName') == 'make-purchase'):
-                                    purchase_made = True
-                    
-                    # Stop after reasonable messages
-                    if messages_count > 20:  # Reduced from 30
-                        print(f"\n⚡ Stopping at {messages_count} messages (limit reached)")
-                        break
+                            elif isinstance(message, UserMessage) and pending_writes:
+                                # The save only counts once its tool result comes back
+                                if self._remember_confirmed_writes(message, pending_writes):
+                                    analysis_saved = True
+                        
+                            # Nothing left to do once the data is bought and saved
+                            if purchase_made and analysis_saved:
+                                break
+                        
+                            # Stop after reasonable messages
+                            if messages_count > 20:  # Reduced from 30
+                                print(f"\n⚡ Stopping at {messages_count} messages (limit reached)")
+                                break
+                    finally:
+                        # Close the stream here so the CLI subprocess is shut down
+                        # now rather than whenever the generator is garbage collected
+                        await stream.aclose()
         
         except RuntimeError as e:
             # Ignore cancel scope errors
@@ -297,7 +505,7 @@ Include: cycle number, timestamp, price, trend analysis, and trading insights.""
         # Summary
         print(f"\n📊 Cycle {self.cycle_count} Summary:")
         print(f"  Messages: {messages_count}")
-        print(f"  Tools used: {len(set(tools_used))}")
+        print(f"  Tools used: {len(tools_used)}")
         
         if purchase_made:
             print("  ✅ Purchase completed")
@@ -305,10 +513,11 @@ Include: cycle number, timestamp, price, trend analysis, and trading insights.""
             # If we found a price, update analysis
             if current_price_found:
                 # Update our analysis with the new price
+                timestamp = datetime.now().isoformat()
                 self.current_analysis = {
                     'price': current_price_found,
                     'cycle': self.cycle_count,
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': timestamp
                 }
                 new_signals = []
                 
@@ -329,12 +538,9 @@ Include: cycle number, timestamp, price, trend analysis, and trading insights.""
                 
                 # Save minimal finding if analysis wasn't saved by Claude
                 if not analysis_saved:
-                    findings_dir = Path("knowledge/research/findings")
-                    findings_dir.mkdir(parents=True, exist_ok=True)
-                    
                     finding = {
                         "cycle": self.cycle_count,
-                        "timestamp": datetime.now().isoformat(),
+                        "timestamp": timestamp,
                         "price": current_price_found,
                         "analysis": {
                             "trend": self.current_analysis.get("trend"),
@@ -343,8 +549,9 @@ Include: cycle number, timestamp, price, trend analysis, and trading insights.""
                         }
                     }
                     
-                    with open(findings_dir / f"cycle_{self.cycle_count}_market_analysis.json", 'w') as f:
-                        json.dump(finding, f, indent=2)
+                    finding_file = self._findings_dir / f"cycle_{self.cycle_count}_market_analysis.json"
+                    await asyncio.to_thread(finding_file.write_bytes, serialization.dumps(finding, indent=True))
+                    self._remember_finding(finding_file.name, finding)
                     print(f"  💾 Saved minimal findings")
             
             # Goal evolution would happen here
@@ -359,29 +566,22 @@ Include: cycle number, timestamp, price, trend analysis, and trading insights.""
         print("\n💱 Researching arbitrage opportunities...")
         
         # Similar structure but focused on DEX data
-        system_prompt = """You are researching arbitrage opportunities across Solana DEXs.
-Use the fluora MCP server to purchase pool and price data from different DEXs."""
-        
-        options = ClaudeCodeOptions(
-            system_prompt=system_prompt,
-            mcp_servers=self.mcp_config['mcpServers'],
-            allowed_tools=[
-                "mcp__fluora__exploreServices",
-                "mcp__fluora__getServiceDetails",
-                "mcp__fluora__callServiceTool",
-                "Write"
-            ],
-            max_turns=150  # Allow plenty of turns
-        )
-        
         prompt = f"""Research arbitrage opportunities by comparing prices across DEXs.
 Make REAL purchases for pool data if available."""
         
-        async for message in claude_query(prompt=prompt, options=options):
-            if isinstance(message, AssistantMessage):
-                for block in message.content:
-                    if isinstance(block, ToolUseBlock) and block.name == "mcp__fluora__callServiceTool" and block.input.get('toolName') == 'make-purchase':
-                        print(f"💳 Making MCP purchase: {block.input.get('itemId', 'unknown')}")
+        pending_writes = {}
+        async with self._purchase_sem:
+            async for message in claude_query(prompt=prompt, options=self._arbitrage_options):
+                if isinstance(message, AssistantMessage):
+                    for block in message.content:
+                        if isinstance(block, ToolUseBlock) and block.name == "mcp__fluora__callServiceTool" and block.input.get('toolName') == 'make-purchase':
+                            print(f"💳 Making MCP purchase: {block.input.get('itemId', 'unknown')}")
+                        elif isinstance(block, ToolUseBlock) and block.name == "Write":
+                            written = self._parse_written_finding(block.input)
+                            if written:
+                                pending_writes[block.id] = written
+                elif isinstance(message, UserMessage) and pending_writes:
+                    self._remember_confirmed_writes(message, pending_writes)
     
     async def research_general(self):
         """General research"""
@@ -393,18 +593,10 @@ Make REAL purchases for pool data if available."""
         print("\n🧠 Using Claude to generate intelligent research goals...")
         
         # Look at any previous research findings
-        previous_insights = []
-        findings_dir = Path("knowledge/research/findings")
-        if findings_dir.exists():
-            recent_files = sorted(findings_dir.glob("*.json"))[-10:]
-            for f in recent_files:
-                try:
-                    with open(f) as file:
-                        data = json.load(file)
-                        if 'insights' in data:
-                            previous_insights.append(data['insights'])
-                except:
-                    pass
+        previous_insights = [
+            data['insights'] for _, data in self._recent_findings
+            if isinstance(data, dict) and 'insights' in data
+        ]
         
         # Build context
         context = ""
@@ -413,56 +605,18 @@ Make REAL purchases for pool data if available."""
             for insight in previous_insights[-5:]:
                 context += f"- {insight[:100]}...\n"
         
-        system_prompt = """You are a strategic research planner for a Solana trading agent.
-Your task is to generate intelligent, actionable research goals based on current market conditions.
-The agent has access to the Cambrian API for real-time Solana data."""
-        
-        options = ClaudeCodeOptions(
-            system_prompt=system_prompt,
-            allowed_tools=["Write"],
-            max_turns=100  # Allow plenty of turns for goal generation
+        prompt = GOAL_GENERATION_PROMPT.format(
+            context=context,
+            goals_file=self._goals_file_abs,
+            created_at=datetime.now().isoformat()
         )
         
-        prompt = f"""Generate 3-5 strategic research goals for a Solana trading agent.
-{context}
-Consider:
-1. Current market conditions and trends
-2. Different types of trading strategies (momentum, arbitrage, liquidity provision)
-3. Risk management and portfolio optimization
-4. Specific Solana ecosystem opportunities
-
-Create goals that are:
-- Specific and measurable
-- Achievable through data analysis
-- Relevant to profitable trading
-- Time-bound (can make progress each cycle)
-
-Save the goals to: {os.path.abspath('knowledge/goals/goals.json')}
-
-Format exactly as shown (include ALL fields):
-{{
-  "goals": [
-    {{
-      "id": "goal_001",
-      "title": "Clear, specific goal title",
-      "description": "Detailed description of what to research and why",
-      "status": "active",
-      "priority": "high",
-      "created_at": "{datetime.now().isoformat()}",
-      "progress": 0,
-      "metrics": ["metric1", "metric2"]
-    }}
-  ]
-}}
-
-Make the goals diverse and complementary, covering different aspects of Solana trading."""
-        
         messages_count = 0
         try:
             # Suppress RuntimeError about cancel scope
             with warnings.catch_warnings():
                 warnings.filterwarnings("ignore")
-                async for message in claude_query(prompt=prompt, options=options):
+                async for message in claude_query(prompt=prompt, options=self._goal_options):
                     messages_count += 1
                     if isinstance(message, AssistantMessage):
                         for block in message.content:
@@ -480,22 +634,56 @@ Make the goals diverse and complementary, covering different aspects of Solana t
     async def run(self):
         """Main agent loop"""
         self.running = True
+        loop = asyncio.get_running_loop()
+        
+        # Let SIGTERM end the loop at the next cycle boundary
+        try:
+            loop.add_signal_handler(SIGTERM, self.stop)
+        except (NotImplementedError, RuntimeError):
+            pass  # Signal handlers are unavailable (e.g. Windows)
+        
+        interval = 15  # Default
+        if self.user_config and 'agent' in self.user_config:
+            interval = self.user_config['agent'].get('cycle_interval_seconds', 15)
         
         try:
+            # Cycles start on a fixed schedule, so time spent in the cycle counts
+            deadline = loop.time()
             while self.running:
                 await self.execute_cycle()
+                if not self.running:
+                    break
                 
                 # Wait before next cycle
-                interval = 15  # Default
-                if self.user_config and 'agent' in self.user_config:
-                    interval = self.user_config['agent'].get('cycle_interval_seconds', 15)
+                deadline += interval
+                remaining = deadline - loop.time()
+                if remaining < 0:
+                    print(f"\n⚠️  Cycle overran the {interval}s interval by {-remaining:.0f} seconds")
+                    deadline = loop.time()
+                    continue
                 
-                print(f"\n💤 Waiting {interval} seconds until next cycle...")
-                await asyncio.sleep(interval)
+                print(f"\n💤 Waiting {remaining:.0f} seconds until next cycle...")
+                await self._wait_until(deadline)
                 
         except KeyboardInterrupt:
             print("\n\n⚠️  Shutting down...")
             self.running = False
+        finally:
+            # Persist any state writes still batched in memory
+            await self.state_manager.flush()
+    
+    def stop(self):
+        """Request a graceful shutdown, waking the loop if it is waiting"""
+        self.running = False
+        self._stop.set()
+    
+    async def _wait_until(self, deadline: float):
+        """Sleep until the loop-time deadline or until stop() is called"""
+        loop = asyncio.get_running_loop()
+        try:
+            await asyncio.wait_for(self._stop.wait(), timeout=max(0, deadline - loop.time()))
+        except asyncio.TimeoutError:
+            pass
     
     def _load_user_config(self):
         """Load user configuration if it exists"""
@@ -519,17 +707,7 @@ async def main():
     # Simplified initialization without setup wizard
     user_config = None
     
-    print("""
-    ╔═══════════════════════════════════════════╗
-    ║     Cambrian Trading Agent v2.0          ║
-    ║        REAL MCP Implementation            ║
-    ║                                           ║
-    ║   💰 Makes REAL monetized purchases! 💰   ║
-    ║                                           ║
-    ║   Using fluora MCP server configured in:  ║
-    ║   config/mcp_config.json                  ║
-    ╚═══════════════════════════════════════════╝
-    """)
+    sys.stdout.write(BANNER)
     
     if user_config and user_config.get('user_direction') != 'default':
         print(f"📊 Direction: {user_config.get('user_direction', 'default')}")
@@ -577,6 +755,6 @@ if __name__ == "__main__":
     loop.set_exception_handler(exception_handler)
     
     try:
-        anyio.run(main)
+        run(main)
     finally:
         loop.close()
\ No newline at end of file
@@ -4,16 +4,16 @@ Core agent implementation using Claude Code SDK
 """
 
 import asyncio
-import json
-import yaml
+import logging
+import signal
 import structlog
 from datetime import datetime
-from pathlib import Path
 from typing import Dict, List, Optional
 
-import anyio
-from claude_code_sdk import query, ClaudeCodeOptions, Message
+from claude_code_sdk import query, ClaudeCodeOptions, AssistantMessage
 
+from ..bootstrap import configure_logging, run
+from ..config import load_agent_config, load_mcp_config
 from ..persistence.state_manager import StateManager
 from ..data.cambrian_client import CambrianClient
 from .goals import GoalManager
@@ -22,6 +22,28 @@ from .research_agent import ResearchAgent
 
 logger = structlog.get_logger()
 
+CYCLE_PROMPT = """You are an autonomous trading agent researching Solana trading strategies using the Cambrian API.
+
+Current Goals:
+{goals_context}
+
+Available Tools:
+- Access to Cambrian API via monetized MCP (fluora server)
+- File system access for saving research and findings
+- Analysis capabilities
+
+Your task:
+1. Review the current goals
+2. Use the Cambrian API to gather relevant data (via fluora MCP)
+3. Analyze the data and identify insights
+4. Save your findings to the appropriate files
+5. Update progress on goals
+
+Focus on goal #1 if it's not completed. Use real Cambrian API data only - no mock data.
+Remember to save all findings to files in the knowledge/ directory.
+
+What specific research or analysis will you perform this cycle?"""
+
 
 class CambrianTradingAgent:
     """Main agent class that orchestrates all components"""
@@ -34,58 +56,92 @@ class CambrianTradingAgent:
         self.orchestrator = Orchestrator(self.config)
         self.research_agent = ResearchAgent(self.config)
         self.running = False
+        self._stop = asyncio.Event()
+        self._loop_interval = float(self.config['agent']['loop_interval'])
+        self._tty_output = self.config['agent'].get('tty_output', True)
+        self._cycle_timeout = self.config['agent'].get('cycle_timeout')
+        # Goal-manager version whose goals were last put into the saved state
+        self._saved_goals_version = None
         
         # Load MCP config
-        mcp_config_path = Path("config/mcp_config.json")
-        with open(mcp_config_path) as f:
-            self.mcp_config = json.load(f)
+        self.mcp_config = load_mcp_config()
+        
+        # Claude options are the same every cycle, so build them once
+        self._options = ClaudeCodeOptions(
+            max_turns=5,
+            allowed_tools=[
+                "Read", "Write", "Edit",
+                "mcp__fluora__make-purchase",
+                "mcp__fluora__list-purchasable-items"
+            ],
+            system_prompt="""You are an autonomous trading research agent. 
+Always use real Cambrian API data via the monetized MCP.
+Save all findings and progress to files.
+Focus on quantifiable metrics and actionable insights."""
+        )
     
     def _load_config(self, config_path: str) -> Dict:
         """Load agent configuration"""
-        with open(config_path) as f:
-            return yaml.safe_load(f)
+        return load_agent_config(config_path)
     
     async def initialize(self):
         """Initialize agent and restore state"""
         logger.info("Initializing Cambrian Trading Agent")
-        print("Initializing agent components...")
+        self._echo("Initializing agent components...")
         
-        # Load previous state
-        state = await self.state_manager.load_state()
+        # Load previous state and goals concurrently
+        state, _ = await asyncio.gather(
+            self.state_manager.load_state(),
+            self.goal_manager.load_goals()
+        )
         if state:
             logger.info("Restored previous state", 
                        last_run=state.get('last_run'),
                        goals_count=len(state.get('active_goals', [])))
-            print(f"✓ Restored previous state (last run: {state.get('last_run', 'unknown')})")
+            self._echo(f"✓ Restored previous state (last run: {state.get('last_run', 'unknown')})")
         else:
-            print("✓ Starting fresh (no previous state)")
+            self._echo("✓ Starting fresh (no previous state)")
         
-        # Initialize goals
-        await self.goal_manager.load_goals()
-        print(f"✓ Loaded {len(self.goal_manager.goals)} research goals")
+        self._echo(f"✓ Loaded {len(self.goal_manager.goals)} research goals")
         
-        logger.info("Agent initialized successfully")
-        print("✓ Agent initialized successfully\n")
+        logger.info("Agent initialized successfully", goals_count=len(self.goal_manager.goals))
+        self._echo("✓ Agent initialized successfully\n")
+    
+    def _echo(self, message: str):
+        """Print decorative console output unless tty_output is disabled"""
+        if self._tty_output:
+            print(message)
     
     async def run(self):
         """Main agent loop"""
         self.running = True
         logger.info("Starting agent main loop")
+        loop = asyncio.get_running_loop()
+        
+        # Let SIGTERM end the loop at the next cycle boundary
+        try:
+            loop.add_signal_handler(signal.SIGTERM, self.stop)
+        except (NotImplementedError, RuntimeError):
+            pass  # Signal handlers are unavailable (e.g. Windows)
         
         try:
+            # Cycle n is due at start + n * interval, so jitter doesn't accumulate
+            deadline = loop.time()
             while self.running:
-                loop_start = datetime.now()
-                
-                # Execute main agent cycle
-                await self._execute_cycle()
+                # Execute main agent cycle, cancelling it if it gets stuck
+                await self._run_cycle()
                 
                 # Calculate sleep time
-                elapsed = (datetime.now() - loop_start).total_seconds()
-                sleep_time = max(0, self.config['agent']['loop_interval'] - elapsed)
+                deadline += self._loop_interval
+                sleep_time = deadline - loop.time()
                 
-                if sleep_time > 0:
-                    logger.info(f"Sleeping for {sleep_time:.1f} seconds")
-                    await asyncio.sleep(sleep_time)
+                if sleep_time < 0:
+                    logger.warning("Cycle overran loop interval", overrun_seconds=round(-sleep_time, 1))
+                    # Resynchronize rather than running back-to-back catch-up cycles
+                    deadline = loop.time()
+                elif self.running:
+                    logger.info("Sleeping until next cycle", seconds=round(sleep_time, 1))
+                    await self._wait_until(deadline)
         
         except KeyboardInterrupt:
             logger.info("Received interrupt signal")
@@ -94,30 +150,64 @@ class CambrianTradingAgent:
         finally:
             await self.shutdown()
     
+    async def _run_cycle(self):
+        """Run one cycle, cancelling it if it outlives `cycle_timeout`
+        
+        Only the timeout firing counts as a timeout; a TimeoutError raised
+        inside the cycle propagates like any other error.
+        """
+        if not self._cycle_timeout:
+            await self._execute_cycle()
+            return
+        
+        cycle = asyncio.ensure_future(self._execute_cycle())
+        try:
+            done, _ = await asyncio.wait({cycle}, timeout=self._cycle_timeout)
+        except BaseException:
+            cycle.cancel()
+            raise
+        
+        if cycle in done:
+            cycle.result()  # Re-raise anything the cycle raised
+            return
+        
+        cycle.cancel()
+        try:
+            await cycle
+        except asyncio.CancelledError:
+            pass
+        logger.warning("Cycle timed out", timeout_seconds=self._cycle_timeout)
+    
     async def _execute_cycle(self):
         """Execute one cycle of the agent"""
-        logger.info("Starting agent cycle", timestamp=datetime.now().isoformat())
-        print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Executing agent cycle...")
+        now = datetime.now()
+        logger.info("Starting agent cycle", timestamp=now.isoformat())
+        self._echo(f"\n[{now.strftime('%H:%M:%S')}] Executing agent cycle...")
         
         # Get current goals
         active_goals = await self.goal_manager.get_active_goals()
-        logger.info(f"Active goals: {len(active_goals)}")
-        print(f"Active goals: {len(active_goals)}")
+        goals_version = self.goal_manager.version
+        logger.info("Active goals", count=len(active_goals))
+        self._echo(f"Active goals: {len(active_goals)}")
         
         if active_goals:
-            print(f"Working on: {active_goals[0].title}")
+            self._echo(f"Working on: {active_goals[0].title}")
         
         # Use Claude to analyze and execute next steps
         await self._claude_execute_goals(active_goals)
         
-        # Save state
-        await self.state_manager.save_state({
-            'last_run': datetime.now().isoformat(),
-            'active_goals': [g.to_dict() for g in active_goals],
+        # Save state; the goals are only re-serialized when they changed
+        updates = {
+            'last_run': now.isoformat(),
             'cycle_count': self.state_manager.state.get('cycle_count', 0) + 1
-        })
+        }
+        if goals_version != self._saved_goals_version:
+            updates['active_goals'] = [g.to_dict() for g in active_goals]
+            self._saved_goals_version = goals_version
+        await self.state_manager.save_state(updates)
         
-        print(f"[{datetime.now().strftime('%H:%M:%S')}] Cycle completed")
+        logger.info("Cycle completed")
+        self._echo(f"[{datetime.now().strftime('%H:%M:%S')}] Cycle completed")
     
     async def _claude_execute_goals(self, goals: List):
         """Use Claude to analyze goals and execute next steps"""
@@ -128,67 +218,52 @@ class CambrianTradingAgent:
             for g in goals[:3]  # Focus on top 3 goals
         ])
         
-        prompt = f"""You are an autonomous trading agent researching Solana trading strategies using the Cambrian API.
-
-Current Goals:
-{goals_context}
-
-Available Tools:
-- Access to Cambrian API via monetized MCP (fluora server)
-- File system access for saving research and findings
-- Analysis capabilities
-
-Your task:
-1. Review the current goals
-2. Use the Cambrian API to gather relevant data (via fluora MCP)
-3. Analyze the data and identify insights
-4. Save your findings to the appropriate files
-5. Update progress on goals
-
-Focus on goal #1 if it's not completed. Use real Cambrian API data only - no mock data.
-Remember to save all findings to files in the knowledge/ directory.
-
-What specific research or analysis will you perform this cycle?"""
+        prompt = CYCLE_PROMPT.format(goals_context=goals_context)
 
-        # Configure Claude options
-        options = ClaudeCodeOptions(
-            max_turns=5,
-            allowed_tools=[
-                "Read", "Write", "Edit",
-                "mcp__fluora__make-purchase",
-                "mcp__fluora__list-purchasable-items"
-            ],
-            system_prompt="""You are an autonomous trading research agent. 
-Always use real Cambrian API data via the monetized MCP.
-Save all findings and progress to files.
-Focus on quantifiable metrics and actionable insights."""
-        )
-        
         try:
-            messages = []
-            async for message in query(prompt=prompt, options=options):
-                messages.append(message)
+            message_count = 0
+            # structlog's stdlib factory names this module's logger after it;
+            # checked once so nothing is built per message unless DEBUG is on
+            log_blocks = logging.getLogger(__name__).isEnabledFor(logging.DEBUG)
+            async for message in query(prompt=prompt, options=self._options):
+                message_count += 1
                 
-                # Log assistant responses
-                if hasattr(message, 'content') and message.content:
-                    logger.info("Claude response", content=message.content[:200])
+                # Log the shape of assistant responses, not their content
+                if log_blocks and isinstance(message, AssistantMessage) and message.content:
+                    logger.debug("Claude response",
+                                 blocks=[type(block).__name__ for block in message.content])
             
-            logger.info(f"Claude completed cycle with {len(messages)} messages")
+            logger.info("Claude completed cycle", messages=message_count)
             
         except Exception as e:
             logger.error("Error in Claude execution", error=str(e))
     
+    def stop(self):
+        """Request a graceful shutdown, waking the loop if it is waiting"""
+        self.running = False
+        self._stop.set()
+    
+    async def _wait_until(self, deadline: float):
+        """Sleep until the loop-time deadline or until stop() is called"""
+        loop = asyncio.get_running_loop()
+        try:
+            await asyncio.wait_for(self._stop.wait(), timeout=max(0, deadline - loop.time()))
+        except asyncio.TimeoutError:
+            pass
+    
     async def shutdown(self):
         """Graceful shutdown"""
         logger.info("Shutting down agent")
         self.running = False
         
         # Save final state
+        now = datetime.now().isoformat()
         await self.state_manager.save_state({
-            'last_run': datetime.now().isoformat(),
-            'shutdown_time': datetime.now().isoformat(),
+            'last_run': now,
+            'shutdown_time': now,
             'status': 'stopped'
         })
+        await self.state_manager.flush()
 
 
 async def main():
@@ -199,22 +274,5 @@ async def main():
 
 
 if __name__ == "__main__":
-    # Configure structured logging
-    structlog.configure(
-        processors=[
-            structlog.stdlib.filter_by_level,
-            structlog.stdlib.add_logger_name,
-            structlog.stdlib.add_log_level,
-            structlog.stdlib.PositionalArgumentsFormatter(),
-            structlog.processors.TimeStamper(fmt="iso"),
-            structlog.processors.StackInfoRenderer(),
-            structlog.processors.format_exc_info,
-            structlog.processors.UnicodeDecoder(),
-            structlog.dev.ConsoleRenderer()
-        ],
-        context_class=dict,
-        logger_factory=structlog.stdlib.LoggerFactory(),
-        cache_logger_on_first_use=True,
-    )
-    
-    anyio.run(main)
\ No newline at end of file
+    configure_logging()
+    run(main)
\ No newline at end of file
@@ -2,7 +2,7 @@
 Goal management system for the agent
 """
 
-import json
+import aiofiles
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -10,8 +10,13 @@ from dataclasses import dataclass, field
 
 import structlog
 
+from ..persistence import serialization
+
 logger = structlog.get_logger()
 
+# Sort rank for goal priorities; unknown priorities sort last
+PRIORITY_ORDER = {"high": 0, "medium": 1, "low": 2}
+
 
 @dataclass
 class Goal:
@@ -49,24 +54,32 @@ class GoalManager:
     
     def __init__(self, config: Dict):
         self.config = config
+        self.log = logger.bind(component="goals")
         self.goals_path = Path("knowledge/goals")
+        self.findings_path = Path("knowledge/research/findings")
+        self._findings_path_ready = False
         self.goals: List[Goal] = []
+        # Bumped whenever goals change; keys the active-goals cache
+        self.version = 0
+        self._active_cache = None
     
     async def load_goals(self):
         """Load goals from JSON file"""
         goals_file = self.goals_path / "goals.json"
         
-        if not goals_file.exists():
-            logger.warning("No goals file found, creating default goals")
-            self.goals = []
-            return
-        
         try:
+            if not goals_file.exists():
+                self.log.warning("No goals file found, creating default goals")
+                self.goals = []
+                return
+            
             # Load goals from JSON
-            with open(goals_file, 'r') as f:
-                data = json.load(f)
+            with open(goals_file, 'rb') as f:
+                data = serialization.loads(f.read())
                 
             self.goals = []
+            # Default timestamp for goals that don't carry their own
+            now = datetime.now().isoformat()
             for goal_data in data.get('goals', []):
                 # Convert the goal format from Claude's output
                 goal = Goal(
@@ -75,27 +88,30 @@ class GoalManager:
                     description=goal_data.get('description', ''),
                     priority=goal_data.get('priority', 'medium'),
                     status=goal_data.get('status', 'active'),
-                    created_at=goal_data.get('created_at', datetime.now().isoformat()),
-                    updated_at=goal_data.get('updated_at', datetime.now().isoformat()),
+                    created_at=goal_data.get('created_at', now),
+                    updated_at=goal_data.get('updated_at', now),
                     metrics=goal_data.get('metrics', {}),
                     findings=goal_data.get('findings', [])
                 )
                 self.goals.append(goal)
             
-            logger.info(f"Loaded {len(self.goals)} goals from JSON")
+            self.log.info("Loaded goals from JSON", count=len(self.goals))
         except Exception as e:
-            logger.error(f"Error loading goals: {e}")
+            self.log.error("Error loading goals", error=str(e))
             self.goals = []
+        finally:
+            self.version += 1
     
     async def get_active_goals(self) -> List[Goal]:
         """Get goals that are not completed, sorted by priority"""
-        active = [g for g in self.goals if g.status != "completed"]
-        
-        # Sort by priority
-        priority_order = {"high": 0, "medium": 1, "low": 2}
-        active.sort(key=lambda g: priority_order.get(g.priority, 999))
-        
-        return active
+        if self._active_cache is None or self._active_cache[0] != self.version:
+            rank = PRIORITY_ORDER.get
+            active = sorted(
+                (g for g in self.goals if g.status != "completed"),
+                key=lambda g: rank(g.priority, 999)
+            )
+            self._active_cache = (self.version, active)
+        return list(self._active_cache[1])
     
     async def update_goal(self, goal_id: str, updates: Dict):
         """Update a goal's status or findings"""
@@ -105,39 +121,47 @@ class GoalManager:
                     if hasattr(goal, key):
                         setattr(goal, key, value)
                 goal.updated_at = datetime.now().isoformat()
+                self.version += 1
                 
-                logger.info(f"Updated goal {goal_id}", updates=updates)
+                self.log.info("Updated goal", goal_id=goal_id, updates=updates)
                 await self._save_goals()
                 return goal
         
-        logger.warning(f"Goal {goal_id} not found")
+        self.log.warning("Goal not found", goal_id=goal_id)
         return None
     
     async def add_finding(self, goal_id: str, finding: str):
         """Add a finding to a goal"""
         for goal in self.goals:
             if goal.id == goal_id:
+                now = datetime.now()
+                timestamp = now.isoformat()
                 goal.findings.append({
-                    'timestamp': datetime.now().isoformat(),
+                    'timestamp': timestamp,
                     'finding': finding
                 })
-                goal.updated_at = datetime.now().isoformat()
+                goal.updated_at = timestamp
+                self.version += 1
                 
-                # Save finding to file
-                finding_file = Path(f"knowledge/research/findings/{goal_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md")
-                finding_file.parent.mkdir(parents=True, exist_ok=True)
+                # Save finding to file, creating the directory on first use
+                if not self._findings_path_ready:
+                    self.findings_path.mkdir(parents=True, exist_ok=True)
+                    self._findings_path_ready = True
+                finding_file = self.findings_path / f"{goal_id}_{now.strftime('%Y%m%d_%H%M%S')}.md"
                 
-                with open(finding_file, 'w') as f:
-                    f.write(f"# Finding for {goal.title}\n\n")
-                    f.write(f"**Date**: {datetime.now().isoformat()}\n\n")
-                    f.write(f"**Goal**: {goal.title}\n\n")
-                    f.write(f"## Finding\n\n{finding}\n")
+                async with aiofiles.open(finding_file, 'w') as f:
+                    await f.write(
+                        f"# Finding for {goal.title}\n\n"
+                        f"**Date**: {timestamp}\n\n"
+                        f"**Goal**: {goal.title}\n\n"
+                        f"## Finding\n\n{finding}\n"
+                    )
                 
-                logger.info(f"Added finding to goal {goal_id}")
+                self.log.info("Added finding to goal", goal_id=goal_id)
                 await self._save_goals()
                 return
         
-        logger.warning(f"Goal {goal_id} not found")
+        self.log.warning("Goal not found", goal_id=goal_id)
     
     async def _create_default_goals(self):
         """Create default goals file"""
@@ -148,10 +172,11 @@ class GoalManager:
         """Save goals state to JSON"""
         state_file = self.goals_path / "goals_state.json"
         
-        with open(state_file, 'w') as f:
-            json.dump({
-                'goals': [g.to_dict() for g in self.goals],
-                'last_updated': datetime.now().isoformat()
-            }, f, indent=2)
+        content = serialization.dumps({
+            'goals': [g.to_dict() for g in self.goals],
+            'last_updated': datetime.now().isoformat()
+        }, indent=True)
+        async with aiofiles.open(state_file, 'wb') as f:
+            await f.write(content)
         
-        logger.info("Saved goals state")
\ No newline at end of file
+        self.log.info("Saved goals state")
\ No newline at end of file
@@ -0,0 +1,83 @@
+"""
+Shared startup helpers for the agent entrypoints
+
+Heavy imports are deferred to the functions that need them so importing this
+module stays cheap.
+"""
+
+import functools
+import os
+import sys
+
+
+@functools.lru_cache(maxsize=1)
+def configure_logging():
+    """Configure structured logging (repeated calls are no-ops)"""
+    import structlog
+    
+    processors = [
+        structlog.stdlib.filter_by_level,
+        structlog.stdlib.add_logger_name,
+        structlog.stdlib.add_log_level,
+        structlog.stdlib.PositionalArgumentsFormatter(),
+        # Keeps a caller-supplied timestamp instead of formatting a new one
+        structlog.processors.MaybeTimeStamper(fmt="iso"),
+    ]
+    
+    if sys.stderr.isatty():
+        processors += [
+            structlog.processors.StackInfoRenderer(),
+            structlog.processors.format_exc_info,
+            structlog.processors.UnicodeDecoder(),
+            structlog.dev.ConsoleRenderer()
+        ]
+    else:
+        # Piped to a log collector: plain JSON is cheaper to render and parse
+        processors += [
+            structlog.processors.format_exc_info,
+            structlog.processors.UnicodeDecoder(),
+            structlog.processors.JSONRenderer()
+        ]
+    
+    structlog.configure(
+        processors=processors,
+        context_class=dict,
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        cache_logger_on_first_use=True,
+    )
+
+
+def pin_cpus():
+    """Pin the process to the CPUs listed in AGENT_CPU_AFFINITY, if set
+    
+    Keeps a long-running agent on the same cores between cycles. Only
+    supported where os.sched_setaffinity exists (Linux). CPU ids may be
+    separated by commas or spaces; an unusable value is logged and the
+    process carries on unpinned.
+    """
+    cpus = os.getenv("AGENT_CPU_AFFINITY")
+    if not cpus or not hasattr(os, "sched_setaffinity"):
+        return
+    
+    try:
+        os.sched_setaffinity(0, {int(cpu) for cpu in cpus.replace(",", " ").split()})
+    except (ValueError, OSError) as e:
+        import structlog
+        structlog.get_logger().warning("Ignoring AGENT_CPU_AFFINITY", value=cpus, error=str(e))
+
+
+def run(main, *args):
+    """Run an async entrypoint, using uvloop when it is installed"""
+    import anyio
+    
+    pin_cpus()
+    
+    try:
+        import uvloop  # noqa: F401
+        backend_options = {"use_uvloop": True}
+    except ImportError:
+        import structlog
+        structlog.get_logger().warning("uvloop not installed, using the default asyncio event loop")
+        backend_options = {}
+    
+    return anyio.run(main, *args, backend_options=backend_options)
@@ -0,0 +1,5 @@
+"""Configuration loading for Cambrian Trading Agent"""
+
+from .loader import load_agent_config, load_mcp_config
+
+__all__ = ['load_agent_config', 'load_mcp_config']
@@ -0,0 +1,52 @@
+"""
+Cached loading of configuration files
+"""
+
+import copy
+import hashlib
+import json
+import os
+from typing import Any, Callable, Dict, Tuple
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
+# Absolute path -> (content fingerprint, parsed config)
+_cache: Dict[str, Tuple[bytes, Any]] = {}
+
+
+def load_mcp_config(path: str = "config/mcp_config.json") -> Dict:
+    """Load the MCP server config
+    
+    Not cached: the file is small enough that parsing it is cheaper than
+    fingerprinting and copying a cached result.
+    """
+    with open(path, 'rb') as f:
+        return json.load(f)
+
+
+def load_agent_config(path: str = "config/agent_config.yaml") -> Dict:
+    """Load the agent YAML config, re-parsing only when the file changes
+    
+    Each caller gets its own copy, so it is safe to modify.
+    """
+    return _load_cached(path, lambda data: yaml.load(data, Loader=_YamlLoader))
+
+
+def _load_cached(path: str, parse: Callable[[bytes], Any]) -> Any:
+    """Parse a config file, reusing the last result while its contents are unchanged"""
+    path = os.path.abspath(path)
+    with open(path, 'rb') as f:
+        data = f.read()
+    
+    # Fingerprint the contents rather than trusting mtime/size, which can
+    # miss a same-size copy that preserves timestamps
+    fingerprint = hashlib.blake2b(data, digest_size=8).digest()
+    cached = _cache.get(path)
+    if cached is None or cached[0] != fingerprint:
+        cached = _cache[path] = (fingerprint, parse(data))
+    return copy.deepcopy(cached[1])
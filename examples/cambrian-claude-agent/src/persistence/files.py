@@ -0,0 +1,28 @@
+"""
+Helpers for scanning the knowledge directory
+"""
+
+import fnmatch
+import heapq
+import os
+from pathlib import Path
+from typing import List
+
+
+def newest_files(directory: Path, pattern: str, count: int) -> List[Path]:
+    """Return up to `count` files matching `pattern`, oldest first and newest last
+    
+    Uses a single scandir pass and a bounded heap, so only the newest `count`
+    entries are ever ordered.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            candidates = [
+                (entry.stat().st_mtime_ns, entry.path)
+                for entry in entries
+                if fnmatch.fnmatch(entry.name, pattern) and entry.is_file()
+            ]
+    except FileNotFoundError:
+        return []
+    
+    return [Path(path) for _, path in reversed(heapq.nlargest(count, candidates))]
@@ -0,0 +1,51 @@
+"""
+JSON encoding helpers that use orjson when it is installed
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library
+    orjson = None
+
+
+def dumps(obj: Any, indent: bool = False, default: Optional[Callable] = None) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes, optionally indented by two spaces
+    
+    Both backends accept the same input: non-str dict keys are coerced to
+    strings, and datetimes are handed to `default` rather than encoded
+    natively by orjson, so files look the same with or without it.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=default, option=option)
+    return json.dumps(obj, indent=2 if indent else None, default=default).encode()
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def read_json(path: Path) -> Any:
+    """Read and parse a JSON file
+    
+    This is blocking; call it through asyncio.to_thread from async code.
+    """
+    return loads(path.read_bytes())
+
+
+def write_json(path: Path, obj: Any, default: Optional[Callable] = None):
+    """Write obj as indented JSON, creating the parent directory if needed
+    
+    This is blocking; call it through asyncio.to_thread from async code.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(dumps(obj, indent=True, default=default))
@@ -2,7 +2,8 @@
 State management for agent persistence
 """
 
-import json
+import asyncio
+import os
 import aiofiles
 from pathlib import Path
 from typing import Dict, Optional
@@ -10,6 +11,8 @@ from datetime import datetime
 
 import structlog
 
+from . import serialization
+
 logger = structlog.get_logger()
 
 
@@ -18,59 +21,106 @@ class StateManager:
     
     def __init__(self, config: Dict):
         self.config = config
+        self.log = logger.bind(component="state")
         self.state_file = Path(config['persistence']['state_file'])
         self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        self.checkpoint_dir = self.state_file.parent / "checkpoints"
+        self._checkpoint_dir_ready = False
         self.state: Dict = {}
+        
+        # Only write to disk every N saves; flush() persists anything pending
+        self.flush_interval = max(1, int(config['persistence'].get('flush_interval', 1)))
+        self._pending_saves = 0
+        self._writer: Optional[asyncio.Task] = None
     
     async def load_state(self) -> Optional[Dict]:
         """Load state from file"""
         if not self.state_file.exists():
-            logger.info("No previous state found")
+            self.log.info("No previous state found")
             return None
         
         try:
-            async with aiofiles.open(self.state_file, 'r') as f:
+            async with aiofiles.open(self.state_file, 'rb') as f:
                 content = await f.read()
-                self.state = json.loads(content)
-                logger.info("Loaded previous state", 
+                self.state = serialization.loads(content)
+                self.log.info("Loaded previous state", 
                            last_run=self.state.get('last_run'),
                            cycle_count=self.state.get('cycle_count', 0))
                 return self.state
         except Exception as e:
-            logger.error(f"Failed to load state", error=str(e))
+            self.log.error("Failed to load state", error=str(e))
             return None
     
     async def save_state(self, updates: Dict):
-        """Save state to file"""
+        """Update state, writing it to file every `flush_interval` saves
+        
+        The write runs in a background task so callers don't wait on disk.
+        Saves that arrive while a write is in flight are coalesced into the
+        next write rather than queued one by one.
+        """
         self.state.update(updates)
+        self._pending_saves += 1
+        
+        if self._pending_saves >= self.flush_interval and (self._writer is None or self._writer.done()):
+            self._writer = asyncio.create_task(self._write_pending())
+    
+    async def flush(self):
+        """Wait for any background write, then write whatever is still pending"""
+        if self._writer is not None:
+            await self._writer
+        if self._pending_saves:
+            # Go through the writer task so save_state can't start a second,
+            # concurrent write to the same temp file
+            self._writer = asyncio.create_task(self._write())
+            await self._writer
+    
+    async def _write_pending(self):
+        """Background writer: keep writing until the pending saves drop below the interval"""
+        while self._pending_saves >= self.flush_interval:
+            if not await self._write():
+                break
+    
+    async def _write(self) -> bool:
+        """Write the current state to file via a temp file and atomic rename"""
+        # Snapshot before the first await so the write is self-consistent
+        pending = self._pending_saves
         self.state['last_saved'] = datetime.now().isoformat()
+        tmp_file = self.state_file.with_suffix('.tmp')
         
         try:
-            async with aiofiles.open(self.state_file, 'w') as f:
-                await f.write(json.dumps(self.state, indent=2))
-            logger.info("State saved successfully")
+            content = serialization.dumps(self.state, indent=True)
+            async with aiofiles.open(tmp_file, 'wb') as f:
+                await f.write(content)
+            os.replace(tmp_file, self.state_file)
+            self._pending_saves -= pending
+            self.log.info("State saved successfully")
+            return True
         except Exception as e:
-            logger.error(f"Failed to save state", error=str(e))
+            self.log.error("Failed to save state", error=str(e))
+            return False
     
     async def checkpoint(self, checkpoint_data: Dict):
         """Create a checkpoint of current progress"""
-        checkpoint_dir = self.state_file.parent / "checkpoints"
-        checkpoint_dir.mkdir(exist_ok=True)
+        # Created on first use so agents that never checkpoint don't get the directory
+        if not self._checkpoint_dir_ready:
+            self.checkpoint_dir.mkdir(exist_ok=True)
+            self._checkpoint_dir_ready = True
         
-        checkpoint_file = checkpoint_dir / f"checkpoint_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        now = datetime.now()
+        checkpoint_file = self.checkpoint_dir / f"checkpoint_{now.strftime('%Y%m%d_%H%M%S')}.json"
         
         checkpoint = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': now.isoformat(),
             'state': self.state.copy(),
             'checkpoint_data': checkpoint_data
         }
         
         try:
-            async with aiofiles.open(checkpoint_file, 'w') as f:
-                await f.write(json.dumps(checkpoint, indent=2))
-            logger.info(f"Checkpoint created", file=checkpoint_file.name)
+            async with aiofiles.open(checkpoint_file, 'wb') as f:
+                await f.write(serialization.dumps(checkpoint, indent=True))
+            self.log.info("Checkpoint created", file=checkpoint_file.name)
         except Exception as e:
-            logger.error(f"Failed to create checkpoint", error=str(e))
+            self.log.error("Failed to create checkpoint", error=str(e))
     
     def get_state(self) -> Dict:
         """Get current state"""
@@ -0,0 +1,33 @@
+"""Tests for the shared startup helpers"""
+
+import os
+
+import pytest
+
+from src import bootstrap
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(os, "sched_setaffinity"), reason="CPU affinity is Linux-only"
+)
+
+
+@pytest.mark.parametrize("value", ["0-3", "abc", "999999"])
+def test_pin_cpus_ignores_malformed_affinity(monkeypatch, value):
+    before = os.sched_getaffinity(0)
+    monkeypatch.setenv("AGENT_CPU_AFFINITY", value)
+    
+    bootstrap.pin_cpus()
+    
+    assert os.sched_getaffinity(0) == before
+
+
+def test_pin_cpus_accepts_loose_separators(monkeypatch):
+    before = os.sched_getaffinity(0)
+    cpu = min(before)
+    monkeypatch.setenv("AGENT_CPU_AFFINITY", f" {cpu}, ,")
+    
+    try:
+        bootstrap.pin_cpus()
+        assert os.sched_getaffinity(0) == {cpu}
+    finally:
+        os.sched_setaffinity(0, before)
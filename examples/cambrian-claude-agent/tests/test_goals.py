@@ -0,0 +1,28 @@
+"""Tests for GoalManager"""
+
+import asyncio
+import json
+
+from src.agent.goals import GoalManager
+
+
+def _write_goals(tmp_path, goals):
+    goals_dir = tmp_path / "knowledge" / "goals"
+    goals_dir.mkdir(parents=True, exist_ok=True)
+    goals_file = goals_dir / "goals.json"
+    goals_file.write_text(json.dumps({"goals": goals}))
+    return goals_file
+
+
+def test_reload_without_goals_file_clears_active_goals(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    goals_file = _write_goals(tmp_path, [{"id": "g1", "title": "Market analysis"}])
+    manager = GoalManager({})
+    
+    asyncio.run(manager.load_goals())
+    assert [g.id for g in asyncio.run(manager.get_active_goals())] == ["g1"]
+    
+    goals_file.unlink()
+    asyncio.run(manager.load_goals())
+    assert manager.goals == []
+    assert asyncio.run(manager.get_active_goals()) == []
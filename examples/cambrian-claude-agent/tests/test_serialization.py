@@ -0,0 +1,13 @@
+"""Tests for the JSON helpers"""
+
+import json
+from datetime import datetime
+
+from src.persistence import serialization
+
+
+def test_dumps_matches_the_stdlib_fallback():
+    obj = {1: 'x', 'when': datetime(2020, 1, 1), 'values': [1.5, None, True]}
+    
+    expected = json.dumps(obj, indent=2, default=str).encode()
+    assert serialization.dumps(obj, indent=True, default=str) == expected
@@ -0,0 +1,40 @@
+"""Tests for StateManager"""
+
+import asyncio
+
+from src.persistence import serialization
+from src.persistence.state_manager import StateManager
+
+
+def _manager(tmp_path):
+    return StateManager({'persistence': {'state_file': str(tmp_path / "state.json")}})
+
+
+def test_unserializable_state_is_logged_not_raised(tmp_path):
+    async def scenario():
+        manager = _manager(tmp_path)
+        await manager.save_state({'bad': object()})
+        await manager.flush()
+        
+        del manager.state['bad']
+        await manager.flush()
+        return manager
+    
+    manager = asyncio.run(scenario())
+    assert manager.state_file.exists()
+    assert 'bad' not in serialization.read_json(manager.state_file)
+
+
+def test_flush_during_background_write_writes_once_at_a_time(tmp_path):
+    async def scenario():
+        manager = _manager(tmp_path)
+        await manager.save_state({'cycle_count': 1})
+        flushing = asyncio.ensure_future(manager.flush())
+        await manager.save_state({'cycle_count': 2})
+        await flushing
+        await manager.flush()
+        return manager
+    
+    manager = asyncio.run(scenario())
+    assert serialization.read_json(manager.state_file)['cycle_count'] == 2
+    assert not manager.state_file.with_suffix('.tmp').exists()
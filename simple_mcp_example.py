@@ -20,6 +20,7 @@ See docs/SETUP.md for detailed instructions.
 import anyio
 import os
 import json
+from importlib.util import find_spec
 from dotenv import load_dotenv
 from claude_code_sdk import query, ClaudeCodeOptions
 
@@ -87,4 +88,7 @@ async def main():
 
 if __name__ == "__main__":
     print("=== Simple Cambrian API MCP Example ===\n")
-    anyio.run(main)
\ No newline at end of file
+    
+    # Use uvloop's faster event loop when it is installed
+    backend_options = {"use_uvloop": True} if find_spec("uvloop") else {}
+    anyio.run(main, backend_options=backend_options)
\ No newline at end of file
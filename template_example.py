@@ -21,24 +21,19 @@ class MonetizedMCPTemplate:
         with open(config_path) as f:
             self.mcp_config = json.load(f)
         
+        # Build the server command and environment once; they don't change
+        server_config = self.mcp_config['mcpServers']['fluora']
+        self._server_cmd = [server_config['command']] + server_config['args']
+        self._server_env = {**os.environ, **server_config['env']}
+        
         # Initialize your agent here
         self.agent = None  # Replace with your agent instance
         
     def start_mcp_server(self):
         """Start the Fluora MCP server as a subprocess"""
-        server_config = self.mcp_config['mcpServers']['fluora']
-        
-        # Build the command
-        cmd = [server_config['command']] + server_config['args']
-        
-        # Set environment variables
-        env = os.environ.copy()
-        env.update(server_config['env'])
-        
-        # Start the server
         process = subprocess.Popen(
-            cmd,
-            env=env,
+            self._server_cmd,
+            env=self._server_env,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE
         )
@@ -3,9 +3,13 @@
 Test script to verify MCP tools are available and working
 """
 
-import asyncio
+import anyio
 import json
-from claude_code_sdk import query, ClaudeCodeOptions, AssistantMessage, TextBlock, ToolUseBlock
+from importlib.util import find_spec
+from claude_code_sdk import (
+    query, ClaudeCodeOptions, AssistantMessage, UserMessage,
+    TextBlock, ToolUseBlock, ToolResultBlock
+)
 
 async def test_mcp_tools():
     """Test if MCP tools are available"""
@@ -48,10 +52,10 @@ Just call the tool with an empty category '' to list all available servers."""
                     if block.name.startswith("mcp__fluora"):
                         tool_used = True
         
-        # Check for errors in the response
-        if hasattr(message, 'content'):
+        # Check for errors in the tool results
+        if isinstance(message, (AssistantMessage, UserMessage)) and isinstance(message.content, list):
             for block in message.content:
-                if hasattr(block, 'content') and isinstance(block.content, str):
+                if isinstance(block, ToolResultBlock) and isinstance(block.content, str):
                     if "permission" in block.content.lower() or "error" in block.content.lower():
                         error_occurred = True
                         print(f"\n❌ Error: {block.content}")
@@ -69,4 +73,6 @@ Just call the tool with an empty category '' to list all available servers."""
         print("3. Your ANTHROPIC_API_KEY is set")
 
 if __name__ == "__main__":
-    asyncio.run(test_mcp_tools())
\ No newline at end of file
+    # Use uvloop's faster event loop when it is installed
+    backend_options = {"use_uvloop": True} if find_spec("uvloop") else {}
+    anyio.run(test_mcp_tools, backend_options=backend_options)
\ No newline at end of file